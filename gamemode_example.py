@@ -6,11 +6,13 @@ All major endpoints are listed here. Uncomment some to try them out.
 These basic examples use the `time` keyword argument. You can experiment with
 others. Time is optional and the commands will run indefinitely if not set.
 
-All commands return a response code from the app.
+All commands return a response code from the app, except `stop()`, which
+is sent in the background and returns `None` unless called with `wait=True`.
 Enabling logging will show more info about what is happening behind the scenes.
 
 Most commands use the `send_command()` method internally.
-They save their command JSON to the `last_command` variable.
+They save their command JSON to the `last_command` variable once the app
+has answered it.
 You can use this to save on processing.
 
 Most commands support the `self.actions.x` StrEnum.
@@ -41,7 +43,7 @@ if __name__ == "__main__":
 
     # Send a set of strength values over time to the app.
     # The following two methods achieve the same result, but `_raw` follows
-    # the docs closer and is called by the normal version.
+    # the docs closer and takes the rule and strength as api strings.
     # This example sends a pattern of strengths with a default interval of
     # 100 ms for 5 seconds time.
     # love.pattern_request([1, 2, 3, 4, 5, 20], time=5)
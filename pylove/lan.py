@@ -7,10 +7,133 @@ class constructor. The "Accepting control from third-party apps"
 should show your app name. The home tab section should also say "Toy controlled
 by" your app name.
 """
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+)
 from enum import StrEnum
+from types import MappingProxyType
+from collections import deque
+from copy import deepcopy
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
-import requests
+import threading
+import time as _time
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to stdlib json
+    orjson = None
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, else the stdlib json module."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _decode_nested(value: str) -> Any:
+    """Decode a string holding an encoded JSON object or array.
+
+    Args:
+        value (str): The string to try and decode
+
+    Returns:
+        Any: The decoded data, or the same string if it is not encoded JSON
+    """
+    if value[:1] not in ("{", "["):
+        return value
+    try:
+        return _json_loads(value)
+    except ValueError:  # also covers orjson.JSONDecodeError
+        return value
+
+
+def _parse_data(response: Any) -> Any:
+    """Response parser for commands that may return data as encoded json."""
+    if isinstance(response, dict):
+        data = response.get("data")
+        if isinstance(data, str):
+            response["data"] = _decode_nested(data)
+    return response
+
+
+def _parse_toys(response: Any) -> Any:
+    """Response parser for GetToys, where data.toys is encoded json."""
+    response = _parse_data(response)
+    data = response.get("data") if isinstance(response, dict) else None
+    if isinstance(data, dict):
+        toys = data.get("toys")
+        if isinstance(toys, str):
+            data["toys"] = _decode_nested(toys)
+    return response
+
+
+def _parse_ack(response: Any) -> Any:
+    """Response parser for commands that only return a code and type."""
+    return response
+
+
+# response parsers for the documented commands, others use _parse_json()
+_PARSERS = {
+    "GetToys": _parse_toys,
+    "GetToyName": _parse_data,
+    "Function": _parse_ack,
+    "Pattern": _parse_ack,
+    "Preset": _parse_ack,
+}
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode JSON into the bytes sent as a request body."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # orjson rejects subclasses such as numpy.float64, retry below
+            pass
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _clamp_time_sec(time_sec: float) -> float:
+    """Clamp a non zero timeSec value into the range accepted by the app."""
+    return max(1, min(time_sec, 6000))
+
+
+def _no_log(*args: Any, **kwargs: Any) -> None:
+    """Stand-in for print() while logging is disabled."""
+
+
+class _LoggedBody:
+    """Log argument for an encoded command, decoded only when printed so it
+        shows the same dict as the other commands."""
+
+    __slots__ = ("body",)
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def __str__(self) -> str:
+        return str(_json_loads(self.body))
+
+
+def _report_background_error(future: Future) -> None:
+    """Done callback printing the error of a send nobody waits for."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Error: A background command failed: {future.exception()!r}")
+
+
+def _json_dumps_pretty(data: Any) -> str:
+    """Encode JSON as an indented string for logging and decode_response()."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:  # same fallback as _json_dumps()
+            pass
+    return json.dumps(data, indent=2)
 
 
 class Actions(StrEnum):
@@ -28,6 +151,15 @@ class Actions(StrEnum):
     ALL = "All"
 
 
+# clamped pattern strengths are 0-20, so their bytes are precomputed
+_INT_BYTES = {num: str(num).encode() for num in range(21)}
+
+# letter code of each action used in the pattern rule string, and the
+# letters the pattern rule accepts
+_ACTION_LETTER = {action.value: action.value[0].lower() for action in Actions}
+_VALID_LETTERS = frozenset("vrptfsd")
+
+
 class Presets(StrEnum):
     """Data class to hold the magic string values for Presets"""
     PULSE = "pulse"
@@ -53,11 +185,15 @@ class GameModeWrapper():
     - get_toys(): Gets the toy(s) connect to the Lovense app
     - get_toys_name(): Same as get_toys() but just the name of the devices
     - function_request(): Send a single Pattern immediately
+    - function_request_coalesced(): Merge rapid function requests into one
     - stop(): Sends a stop immediately command
     - pattern_request(): Avoids network pressure of multiple function commands
-    - pattern_request_raw(): More api accurate version for patterns (advanced)
+    - pattern_request_raw(): Same command built from api style strings, not
+        used by pattern_request() (advanced)
     - preset_request(): Send one of the pre-made or user created patterns
     - decode_response(): Make the return value of any command more readable.
+    - invalidate_toys_cache(): Force the next get_toys() to ask the app
+    - close(): Close the pooled connection to the app
 
     ### Attributes
     - app_name: The name of the app
@@ -65,9 +201,48 @@ class GameModeWrapper():
     - log: enable logging in the class. Only has print for now
     - actions: a reference to the Actions StrEnum
     - presets: a reference to the Presets StrEnum
-    - error_codes: A dict of all the expected error codes
+    - error_codes: A read-only dict of all the expected error codes
+    - toys_ttl: seconds get_toys() and get_toys_name() responses are cached
     """
 
+    __slots__ = (
+        "app_name", "api_endpoint", "_ssl_port", "_headers", "_logging",
+        "_log", "actions", "presets", "_last_command", "_last_body",
+        "toys_ttl", "_toys_cache", "_pending", "_pending_timer",
+        "_pending_lock", "_sender", "_session", "_requests", "__weakref__"
+    )
+
+    # A list of all the error code from the docs
+    _ERROR_CODES = MappingProxyType({
+        200: "OK",
+        400: "Invalid Command",
+        401: "Toy Not Found",
+        402: "Toy Not Connected",
+        403: "Toy Doesn't Support This Command",
+        404: "Invalid Parameter",
+        500: "HTTP server not started or disabled",
+        506: "Server Error. Restart Lovense Connect."
+    })
+    error_codes = _ERROR_CODES
+
+    # (min, max) clamp values for the function_request
+    _FUNCTION_RANGE = MappingProxyType({
+        Actions.VIBRATE: (0, 20),
+        Actions.VIBRATE1: (0, 20),
+        Actions.VIBRATE2: (0, 20),
+        Actions.VIBRATE3: (0, 20),
+        Actions.ROTATE: (0, 20),
+        Actions.PUMP: (0, 3),
+        Actions.THRUSTING: (0, 20),
+        Actions.FINGERING: (0, 20),
+        Actions.SUCTION: (0, 20),
+        Actions.DEPTH: (0, 3),
+        Actions.ALL: (0, 20)
+    })
+
+    # the fixed part of every function command
+    _FUNCTION_TEMPLATE = {"command": "Function", "apiVer": 1}
+
     def __init__(
         self,
         app_name: str,
@@ -81,6 +256,10 @@ class GameModeWrapper():
         self.app_name = app_name
         self.api_endpoint = f"http://{local_ip}:{port}/command"
         self._ssl_port = ssl_port
+        self._headers = {
+            "X-platform": app_name,
+            "Content-Type": "application/json"
+        }
         self.log = logging
 
         # References to the StrEnums
@@ -88,34 +267,88 @@ class GameModeWrapper():
         self.presets = Presets
 
         # the last command sent, can be used to send again
-        self.last_command = None
-
-        # A list of all the error code from the docs
-        self.error_codes = {
-            200: "OK",
-            400: "Invalid Command",
-            401: "Toy Not Found",
-            402: "Toy Not Connected",
-            403: "Toy Doesn't Support This Command",
-            404: "Invalid Parameter",
-            500: "HTTP server not started or disabled",
-            506: "Server Error. Restart Lovense Connect."
-        }
+        self._last_command: Optional[Dict[str, Any]] = None
+        self._last_body: Optional[
+            Tuple[Optional[Dict[str, Any]], bytes]
+        ] = None
+
+        # short lived cache for the GetToys and GetToyName responses.
+        # Only informational requests are cached, never commands.
+        self.toys_ttl = 2.0
+        self._toys_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+        # merged actions waiting to be sent by function_request_coalesced(),
+        # kept apart per (toy_id, time) so they are never mixed up
+        self._pending: Dict[
+            Tuple[Optional[str], float], Dict[str, float]
+        ] = {}
+        self._pending_timer: Optional[threading.Timer] = None
+        self._pending_lock = threading.Lock()
+
+        # single sender thread for every command, one worker keeps them in
+        # order whether or not the caller waits for the response
+        self._sender = ThreadPoolExecutor(max_workers=1)
+
+        # keep-alive connection reused for every command sent to the app.
+        # requests is imported here, so importing the enums stays light
+        self._requests: Any = None
+        self._session = self._create_session()
+
+    @property
+    def log(self) -> bool:
+        """enable logging in the class. Only has print for now"""
+        return self._logging
+
+    @log.setter
+    def log(self, enabled: bool) -> None:
+        # bind the log function once so callers don't need to check the flag
+        self._logging = enabled
+        self._log = print if enabled else _no_log
+
+    def __enter__(self) -> "GameModeWrapper":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _create_session(self) -> "requests.Session":
+        """Create the pooled session used to send commands to the app.
 
-        # clamp values for the function_request
-        self._function_range = {
-            Actions.VIBRATE: {"min": 0, "max": 20},
-            Actions.VIBRATE1: {"min": 0, "max": 20},
-            Actions.VIBRATE2: {"min": 0, "max": 20},
-            Actions.VIBRATE3: {"min": 0, "max": 20},
-            Actions.ROTATE: {"min": 0, "max": 20},
-            Actions.PUMP: {"min": 0, "max": 3},
-            Actions.THRUSTING: {"min": 0, "max": 20},
-            Actions.FINGERING: {"min": 0, "max": 20},
-            Actions.SUCTION: {"min": 0, "max": 20},
-            Actions.DEPTH: {"min": 0, "max": 3},
-            Actions.ALL: {"min": 0, "max": 20}
-        }
+        Returns:
+            requests.Session: A session with the X-platform header set
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self._requests = requests
+        session = requests.Session()
+
+        # sets the header data to tell the app who you are.
+        session.headers.update(self._headers)
+
+        # only one host is ever used, retry once for dropped connections
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=1, backoff_factor=0.1)
+        )
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Send any coalesced or background command still waiting, then close
+            the pooled connection to the app. The wrapper can still be used
+            afterwards, commands are then sent without the sender thread."""
+        timer = self._pending_timer
+        if timer is not None:
+            # stop a timer still waiting, or let one already sending finish
+            timer.cancel()
+            timer.join()
+            self._pending_timer = None
+        self._flush_pending()
+        self._sender.shutdown(wait=True)
+        self._session.close()
 
     def _parse_json(
         self,
@@ -123,79 +356,148 @@ class GameModeWrapper():
     ) -> Dict[str, Any]:
         """refactor request for nested encoded objects into json/dict objects
 
+        Walks the data with an explicit stack instead of recursion and only
+        tries to decode strings that look like a JSON object or array.
+        Decoded values are replaced in place, so a response without any
+        nested encoded objects is returned as is without being copied.
+
         Args:
             data (str | dict | list): The data to parse, can be a JSON string.
 
         Returns:
             Dict[str, Any]: The refactored json data
         """
-        # linter warnings ignore because this is a recursive function,
-        # should always be a dict return
+        # linter warnings ignore, should always be a dict return
         if isinstance(data, str):
-            try:
-                return json.loads(data)
-            except ValueError:
-                return data  # type: ignore
-        elif isinstance(data, dict):
-            return {k: self._parse_json(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._parse_json(item) for item in data]  # type: ignore
-        else:
-            return data
+            data = _decode_nested(data)  # type: ignore
+        if not isinstance(data, (dict, list)):
+            return data  # type: ignore
+
+        stack = deque([data])
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    decoded = _decode_nested(value)
+                    if decoded is value:
+                        continue
+                    node[key] = value = decoded
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+        return data  # type: ignore
 
     def send_command(
         self,
         command_data: Dict[str, Any],
-        timeout: int = 10
+        timeout: int = 10,
+        wait: bool = True
     ) -> Optional[Dict[str, Any]]:
         """Directly send a json command to the app and handle the response.
 
         Args:
             command_data (Dict[str, Any]): Json value to send to the app
+            timeout (int, optional): Seconds to wait for the app to answer.
+                Defaults to 10.
+            wait (bool, optional): Wait for the response. If False None is
+                returned right away. Either way commands are sent in the
+                order they were made. Defaults to True.
 
         Returns:
             Optional[Dict[str, Any]]: The json response code from the app
         """
-        # sets the header data to tell the app who you are.
-        headers = {
-            "X-platform": self.app_name
-        }
+        return self._queue(wait, self._send_command_now, command_data, timeout)
 
-        # clamp the time value to an accepted a range.
-        time_sec = command_data.get("timeSec")
-        if time_sec is not None and time_sec != 0:
-            clamped_time = max(1, min(time_sec, 6000))
-            command_data.update({'timeSec': clamped_time})
+    def _queue(
+        self,
+        wait: bool,
+        send: Callable[..., Optional[Dict[str, Any]]],
+        *args: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Run a send on the single sender thread so every command, waited
+            for or not, reaches the app in the order it was made.
 
-        # Log the command data if logging is enabled.
-        if self.log:
-            print(command_data)
+        Args:
+            wait (bool): Block until the send is done and return its result
+            send (Callable): The method doing the actual send
+            *args (Any): Arguments passed on to `send`
+
+        Returns:
+            Optional[Dict[str, Any]]: The result of `send` if `wait` is True,
+                otherwise None.
+        """
+        try:
+            future = self._sender.submit(send, *args)
+        except RuntimeError:
+            # the sender was shut down by close(), send on this thread
+            result = send(*args)
+            return result if wait else None
+        if wait:
+            return future.result()
+        future.add_done_callback(_report_background_error)
+        return None
+
+    def _send_command_now(
+        self,
+        command_data: Dict[str, Any],
+        timeout: float = 10
+    ) -> Optional[Dict[str, Any]]:
+        """Send a json command right away, see send_command().
+
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        body = self._prepare_command(command_data)
+        response_json = self._send_body(
+            body, timeout, command_data.get("command")
+        )
+
+        # only remember commands the app actually answered
+        if response_json is not None:
+            self._remember_command(command_data, body)
+        return response_json
+
+    def _send_body(
+        self,
+        body: bytes,
+        timeout: float = 10,
+        command: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Post an encoded json command to the app and handle the response.
+
+        Args:
+            body (bytes): The encoded json command
+            timeout (float, optional): Seconds to wait for the app to answer.
+                Defaults to 10.
+            command (Optional[str], optional): The name of the command, picks
+                the response parser. Defaults to None for the generic one.
 
-        self.last_command = command_data
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        requests = self._requests
 
         # make a request to the app.
         response = None
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.api_endpoint,
-                json=command_data,
-                headers=headers,
+                data=body,
                 timeout=timeout
             )
         except requests.exceptions.ConnectionError as e:
             print("Error: Failed to establish a new connection")
-            if self.log:
-                print(e)
+            self._log(e)
             return None
         except requests.exceptions.Timeout as e:
             print("Error: Request timed out")
-            if self.log:
-                print(e)
+            self._log(e)
             return None
         except requests.exceptions.RequestException as e:
-            err_message = e
-            if not self.log:
-                err_message = str(e)[:50] + "... Enable logging for more info"
+            err_message = (
+                e if self.log
+                else f"{str(e)[:50]}... Enable logging for more info"
+            )
             print(f'Error: An error occurred in the request: {err_message}')
             return None
 
@@ -204,16 +506,98 @@ class GameModeWrapper():
             print("Error: Received no response from server.")
             return None
 
-        if response.status_code != 200:
+        return self._handle_response(
+            response.status_code, response.content, command
+        )
+
+    def _prepare_command(self, command_data: Dict[str, Any]) -> bytes:
+        """Clamp, log and encode a command before it is sent.
+
+        Sending the same command as last time, like resending last_command,
+        reuses the already encoded body.
+
+        Args:
+            command_data (Dict[str, Any]): Json value to send to the app
+
+        Returns:
+            bytes: The encoded json body ready to be sent
+        """
+        # clamp the time value to an accepted a range.
+        time_sec = command_data.get("timeSec")
+        if time_sec is not None and time_sec != 0:
+            command_data.update({'timeSec': _clamp_time_sec(time_sec)})
+
+        # Log the command data if logging is enabled.
+        self._log(command_data)
+
+        # compare against a snapshot so edits to last_command are picked up
+        if self._last_body is not None:
+            sent_data, body = self._last_body
+            if command_data == sent_data:
+                return body
+        return _json_dumps(command_data)
+
+    def _remember_command(
+        self,
+        command_data: Optional[Dict[str, Any]],
+        body: bytes
+    ) -> None:
+        """Store a command the app answered so it can be sent again.
+            Without command_data it is decoded from the body when needed."""
+        self._last_command = command_data
+        sent_data = None if command_data is None else dict(command_data)
+        self._last_body = (sent_data, body)
+
+    @property
+    def last_command(self) -> Optional[Dict[str, Any]]:
+        """the last command sent, can be used to send again"""
+        if self._last_command is None and self._last_body is not None:
+            body = self._last_body[1]
+            self._remember_command(_json_loads(body), body)
+        return self._last_command
+
+    @last_command.setter
+    def last_command(self, command_data: Optional[Dict[str, Any]]) -> None:
+        # drop the encoded body too, it belongs to the replaced command
+        self._last_command = command_data
+        self._last_body = None
+
+    def _handle_response(
+        self,
+        status_code: int,
+        content: bytes,
+        command: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Check the status code and decode the body of a response.
+
+        Args:
+            status_code (int): The HTTP status code returned by the app
+            content (bytes): The raw body of the response
+            command (Optional[str], optional): The name of the command sent.
+                Known commands use a parser for their response schema, others
+                fall back to searching the whole response for encoded json.
+
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        if status_code != 200:
             print(
                 "Error: Received HTTP status code",
-                response.status_code, "from the server."
+                status_code, "from the server."
             )
             return None
 
         # Parse the JSON response.
-        response_json = response.json()
-        response_json = self._parse_json(response_json)
+        try:
+            response_json = _json_loads(content)
+        except ValueError:
+            print("Error: Received an invalid JSON response from the server.")
+            return None
+        parser = _PARSERS.get(command)  # type: ignore[arg-type]
+        if parser is not None:
+            response_json = parser(response_json)
+        else:
+            response_json = self._parse_json(response_json)
 
         # Retrieve and log the response code and message, if logging is enabled
         if self.log:
@@ -232,16 +616,18 @@ class GameModeWrapper():
         Returns:
             Dict[str, int]: A dictionary containing clamped values of actions.
         """
+        ranges = self._FUNCTION_RANGE
         clamped_actions = {}
         for action, value in actions.items():
-            if action in self._function_range:
-                min_val = self._function_range[action]["min"]
-                max_val = self._function_range[action]["max"]
-                clamped_value = max(min(value, max_val), min_val)
-                clamped_actions[action] = clamped_value
-            else:
+            value_range = ranges.get(action)
+            if value_range is None:
                 # If action not found in FUNCTION_RANGE, use the original value
                 clamped_actions[action] = value
+                continue
+            lo, hi = value_range
+            clamped_actions[action] = (
+                lo if value < lo else hi if value > hi else value
+            )
         return clamped_actions
 
     def function_request(
@@ -251,7 +637,8 @@ class GameModeWrapper():
         loop_on_time: Optional[float] = None,
         loop_off_time: Optional[float] = None,
         toy_id: Optional[str] = None,
-        stop_last: Optional[bool] = None
+        stop_last: Optional[bool] = None,
+        wait: bool = True
     ) -> Optional[Dict[str, Any]]:
         """Send a function request to the app
 
@@ -268,22 +655,42 @@ class GameModeWrapper():
                 None for all devices.
             stop_last (Optional[bool], optional): Whether to stop the previous
                 command. Defaults to None for yes stop.
+            wait (bool, optional): Wait for the response, if False send it in
+                the background and return None. Defaults to True.
 
         Returns:
             Optional[Dict[str, Any]]: A dictionary representing the response
                 if the command is sent successfully, otherwise None.
         """
+        payload = self._build_function_payload(
+            actions, time, loop_on_time, loop_off_time, toy_id, stop_last
+        )
+
+        # sends combined payload
+        return self.send_command(payload, wait=wait)
 
+    def _build_function_payload(
+        self,
+        actions: Dict[str, float] | dict[Actions, float],
+        time: float = 0,
+        loop_on_time: Optional[float] = None,
+        loop_off_time: Optional[float] = None,
+        toy_id: Optional[str] = None,
+        stop_last: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Build the json command for a function request.
+            See function_request() for the arguments.
+
+        Returns:
+            Dict[str, Any]: The function command ready to be sent
+        """
         # Construct the action string
         actions = self._function_clamp_range(actions)
-        action = ','.join(f"{key}:{value}" for key, value in actions.items())
+        action = ','.join([f"{key}:{value}" for key, value in actions.items()])
 
         # Create the required data
         payload = {
-            "command": "Function",
-            "action": action,
-            "timeSec": time,
-            "apiVer": 1
+            **self._FUNCTION_TEMPLATE, "action": action, "timeSec": time
         }
 
         # Add optional parameters if they are provided
@@ -295,19 +702,106 @@ class GameModeWrapper():
             payload["toy"] = toy_id
         if stop_last is not None:
             payload["stopPrevious"] = 1 if stop_last else 0
+        return payload
 
-        # sends combined payload
-        return self.send_command(payload)
+    def function_request_coalesced(
+        self,
+        actions: Dict[str, float] | dict[Actions, float],
+        time: float = 0,
+        toy_id: Optional[str] = None,
+        linger_ms: float = 50
+    ) -> None:
+        """Queue a function request, merging it with any other requests made
+            within `linger_ms`. Only the latest value of each action is sent.
+            Requests for a different toy_id or time are sent separately, and
+            an untimed command matching the last command is not sent again.
 
-    def stop(self, toy_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Send a command to stop a function.
+        Useful for input loops that update the strength faster than the toy
+        can react. Trades up to `linger_ms` of latency for fewer requests.
+        The response is not returned, use function_request() if it's needed.
+
+        Args:
+            actions (Dict[str, int]): A dictionary containing actions as keys
+                and their corresponding values. Use the `Actions` StrEnum.
+            time (float, optional): The time in seconds for the function
+                request. Defaults to 0 for indefinite time.
+            toy_id (Optional[str], optional): The ID of the toy. Defaults to
+                None for all devices.
+            linger_ms (float, optional): How long to wait for more requests
+                before sending, in milliseconds. Defaults to 50.
+        """
+        if self._merge_pending(actions, time, toy_id):
+            self._pending_timer = threading.Timer(
+                linger_ms / 1000, self._flush_pending
+            )
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+
+    def _merge_pending(
+        self,
+        actions: Dict[str, float] | dict[Actions, float],
+        time: float,
+        toy_id: Optional[str]
+    ) -> bool:
+        """Merge actions into the pending coalesced command.
+
+        Returns:
+            bool: True if a new send needs to be scheduled
+        """
+        with self._pending_lock:
+            first = not self._pending
+            self._pending.setdefault((toy_id, time), {}).update(actions)
+            return first
+
+    def _pop_pending(self) -> List[Dict[str, Any]]:
+        """Take the pending coalesced commands out of the queue.
+
+        Returns:
+            List[Dict[str, Any]]: The function commands to send, without the
+                ones that would only repeat the last command.
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+
+        payloads = []
+        for (toy_id, time), actions in pending.items():
+            payload = self._build_function_payload(
+                actions, time, toy_id=toy_id
+            )
+            # a timed command may have run out, so only skip untimed repeats
+            if not time and payload == self.last_command:
+                continue
+            payloads.append(payload)
+        return payloads
+
+    def _flush_pending(self) -> None:
+        """Send the pending coalesced commands, if there are any."""
+        try:
+            for payload in self._pop_pending():
+                self.send_command(payload)
+        finally:
+            # keep the handle until the sends are done so close() can wait
+            # for them, unless a newer timer has been armed meanwhile
+            with self._pending_lock:
+                if self._pending_timer is threading.current_thread():
+                    self._pending_timer = None
+
+    def stop(
+        self,
+        toy_id: Optional[str] = None,
+        wait: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Send a command to stop a function. Returns immediately by default,
+            the stop is sent in the background.
 
         Args:
             toy_id (Optional[str], optional): the ID of the toy to stop.
                 Defaults to None for all toys.
+            wait (bool, optional): Wait for the response of the app.
+                Defaults to False.
         Returns:
-            Optional[Dict[str, Any]]:
-
+            Optional[Dict[str, Any]]: The response if `wait` is True,
+                otherwise None.
         """
         payload = {
             "command": "Function",
@@ -317,7 +811,7 @@ class GameModeWrapper():
         }
         if toy_id is not None:
             payload["toy"] = toy_id
-        return self.send_command(payload)
+        return self.send_command(payload, wait=wait)
 
     def _convert_actions_to_letters(
         self,
@@ -336,27 +830,20 @@ class GameModeWrapper():
         """
 
         letter_codes = []
-        valid_letters = ["v", "r", "p", "t", "f", "s", "d"]
 
         # iterate over all the Actions passed in.
         for action in actions:
 
-            # Check type for string and that the string is not empty
-            if isinstance(action, str) and len(action) > 0:
-                letter = action[0].lower()
-
-                # Only return valid codes
-                if letter not in valid_letters:
-                    continue
-                letter_codes.append(letter)
+            # Return an empty string if its the wrong type or empty
+            if not isinstance(action, str) or not action:
+                return ""
 
-            # Append the first letter of the action directly
-            elif isinstance(action, Actions):
-                letter_codes.append(action[0].lower())
+            # Known actions are one lookup, other strings use the first letter
+            letter = _ACTION_LETTER.get(action) or action[0].lower()
 
-            # Return Actions.All as a default value if its the wrong type
-            else:
-                return ""
+            # Only return valid codes
+            if letter in _VALID_LETTERS:
+                letter_codes.append(letter)
 
         # Only return the codes if there are any code, else return Actions.ALL
         if letter_codes:
@@ -441,25 +928,84 @@ class GameModeWrapper():
 
         # Slice to get the first 50 elements of the list as per the docs
         # Clam the values into an acceptable range
-        pattern = pattern[:50]
-        pattern = [min(max(0, num), 20) for num in pattern]
+        pattern = [
+            0 if num < 0 else 20 if num > 20 else num for num in pattern[:50]
+        ]
 
         # Clam the value into an acceptable range
         # Docs does not list a maximum value, highest in samples is 1000
         # Lowest value must be above 100
-        interval = min(max(interval, 100), 1000)
+        interval = (
+            100 if interval < 100 else 1000 if interval > 1000 else interval
+        )
 
         # Build the rule and strength properties pythonic
-        acts = self._convert_actions_to_letters(actions)
-        rule = f"V:1;F:{acts};S:{interval}#"
-
         # Docs specifies to leave F:; blank for all functions respond
         if Actions.ALL in actions:
-            rule = f"V:1;F:;S:{interval}#"
-        strength = ";".join(map(str, pattern))
+            acts = b""
+        else:
+            acts = self._convert_actions_to_letters(actions).encode()
+        strength = b";".join([
+            _INT_BYTES.get(num) or str(num).encode() for num in pattern
+        ])
+
+        # Same command as pattern_request_raw(), but encoded directly
+        body = self._build_pattern_body(strength, interval, time, toy_id, acts)
+        self._log(_LoggedBody(body))
+        return self._send_pattern_body(body)
+
+    def _build_pattern_body(
+        self,
+        pattern_bytes: bytes,
+        interval: int,
+        time: float,
+        toy_id: Optional[str],
+        acts: bytes
+    ) -> bytes:
+        """Encode a pattern command straight to the json body bytes.
+
+        Args:
+            pattern_bytes (bytes): The clamped strengths separated by ;
+            interval (int): The clamped interval in milliseconds
+            time (float): The duration of the pattern in seconds
+            toy_id (Optional[str]): The ID of the toy, None for all devices
+            acts (bytes): The comma separated action letters, empty for all
+
+        Returns:
+            bytes: The encoded json command
+        """
+        if time:
+            time = _clamp_time_sec(time)
+        toy = b',"toy":' + _json_dumps(toy_id) if toy_id is not None else b""
+        return (
+            b'{"command":"Pattern","rule":"V:1;F:' + acts
+            + b';S:' + str(interval).encode()
+            + b'#","strength":"' + pattern_bytes
+            + b'","timeSec":' + _json_dumps(time)
+            + b',"apiVer":2' + toy + b'}'
+        )
+
+    def _send_pattern_body(self, body: bytes) -> Optional[Dict[str, Any]]:
+        """Send an encoded pattern command, remembering it if answered.
+
+        Args:
+            body (bytes): The encoded json command
 
-        # Pass the construction data over to the raw method to send.
-        return self.pattern_request_raw(strength, rule, time, toy_id)
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        return self._queue(True, self._send_pattern_body_now, body)
+
+    def _send_pattern_body_now(
+        self,
+        body: bytes
+    ) -> Optional[Dict[str, Any]]:
+        """Send an encoded pattern command right away, see
+            _send_pattern_body()."""
+        response_json = self._send_body(body, command="Pattern")
+        if response_json is not None:
+            self._remember_command(None, body)
+        return response_json
 
     def preset_request(
         self,
@@ -499,9 +1045,7 @@ class GameModeWrapper():
             Optional[Dict[str, Any]]: A dictionary containing information
                 about all toys, or None if an error occurred.
         """
-        return self.send_command({
-            "command": "GetToys"
-        })
+        return self._cached_toys_request("GetToys")
 
     def get_toys_name(self) -> Optional[Dict[str, Any]]:
         """Send a command to retrieve names of all toys
@@ -510,9 +1054,48 @@ class GameModeWrapper():
             Optional[Dict[str, Any]]: A dictionary containing names of all
                 toys, or None if an error occurred.
         """
-        return self.send_command({
-            "command": "GetToyName"
-        })
+        return self._cached_toys_request("GetToyName")
+
+    def _cached_toys_request(self, command: str) -> Optional[Dict[str, Any]]:
+        """Send an informational toys command, reusing a recent response.
+
+        Args:
+            command (str): Either "GetToys" or "GetToyName"
+
+        Returns:
+            Optional[Dict[str, Any]]: The response from the app or the cache
+        """
+        cached = self._get_cached_toys(command)
+        if cached is not None:
+            return cached
+        return self._store_toys(command, self.send_command({
+            "command": command
+        }))
+
+    def _get_cached_toys(self, command: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached response for a toys command if it is
+            fresh, so callers can't change the cached one."""
+        cached = self._toys_cache.get(command)
+        if cached is None:
+            return None
+        cached_at, response = cached
+        if _time.monotonic() - cached_at < self.toys_ttl:
+            return deepcopy(response)
+        return None
+
+    def _store_toys(
+        self,
+        command: str,
+        response: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Cache a copy of a successful toys response and pass it through."""
+        if response is not None and response.get("code") == 200:
+            self._toys_cache[command] = (_time.monotonic(), deepcopy(response))
+        return response
+
+    def invalidate_toys_cache(self) -> None:
+        """Drop the cached toys responses, e.g. after connecting a new toy."""
+        self._toys_cache.clear()
 
     def decode_response(self, response: Optional[Dict[str, Any]]) -> str:
         """
@@ -531,10 +1114,10 @@ class GameModeWrapper():
         response_type = response.get('type', "Not Response")
         return_str = f"Response from the app: {response_type}\n"
 
-        # parse the error code and match it to the self.error_codes if it can.
+        # parse the error code and match it to the self._ERROR_CODES if it can
         code = response.get('code')
         if isinstance(code, int):
-            error_message = self.error_codes.get(
+            error_message = self._ERROR_CODES.get(
                 code, "Unknown Error"
             )
             code_message = f"{error_message}, {code}"
@@ -545,7 +1128,7 @@ class GameModeWrapper():
         # if there is any extra data include it here
         data = response.get('data')
         if data is not None:
-            return_str += f"Data: {json.dumps(data, indent=4)}"
+            return_str += f"Data: {_json_dumps_pretty(data)}"
 
         # return the combined response code string.
         return return_str
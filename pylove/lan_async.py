@@ -0,0 +1,315 @@
+"""
+Asyncio version of the lan game mode wrapper found in `pylove.lan`.
+Every request method of `AsyncGameModeWrapper` is a coroutine, so several
+toy commands can be in flight at once, for example:
+
+    async with AsyncGameModeWrapper("My Cool App", "10.0.0.69") as love:
+        toys, _ = await asyncio.gather(
+            love.get_toys(),
+            love.function_request({love.actions.ALL: 2}, time=3)
+        )
+
+Requires the optional aiohttp dependency (pip install pylove[async]).
+The blocking `pylove.lan.GameModeWrapper` is unchanged and needs no event loop.
+"""
+from typing import Any, Dict, Optional
+import asyncio
+import aiohttp
+
+from pylove.lan import Actions, GameModeWrapper, _report_background_error
+
+
+class AsyncGameModeWrapper(GameModeWrapper):
+    """
+    ## Asyncio API wrapper for the LAN/Game Mode version of the Lovense
+    Standard Solutions API
+
+    Takes the same arguments and has the same methods as `GameModeWrapper`,
+    but every request method has to be awaited. A single aiohttp session is
+    shared by all requests, use the class as an async context manager or
+    await close() when done.
+
+    ### Args:
+    - app_name: The name of your application.
+    - local_ip: the ip of the device to connect to
+    - port: the port of the device to connect to
+    - ssl_port: unused but in the Lovense app
+    - logging: enable logging in the class
+    - timeout: total timeout in seconds for each request
+
+    ### Methods:
+    - close(): Close the underlying aiohttp session
+    """
+
+    __slots__ = ("_timeout", "_pending_task", "_background_tail")
+
+    def __init__(
+        self,
+        app_name: str,
+        local_ip: str,
+        port: int = 20010,
+        ssl_port: int = 30010,
+        logging: bool = False,
+        timeout: float = 10
+    ) -> None:
+        self._timeout = timeout
+        super().__init__(app_name, local_ip, port, ssl_port, logging)
+
+        # task that sends the function_request_coalesced() command
+        self._pending_task: Optional[asyncio.Task] = None
+
+        # the last command sent with wait=False. Each one waits for the one
+        # before it, and waited sends wait for all of them to keep the order
+        self._background_tail: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncGameModeWrapper":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def __enter__(self) -> "AsyncGameModeWrapper":
+        raise TypeError(
+            "AsyncGameModeWrapper needs 'async with', not 'with'"
+        )
+
+    # sync only entry points of GameModeWrapper. They would call the async
+    # methods without awaiting them, so refuse instead of dropping commands
+    def _queue(self, *args: Any, **kwargs: Any) -> None:  # type: ignore
+        raise TypeError("AsyncGameModeWrapper does not use the sender thread")
+
+    def _flush_pending(self) -> None:
+        raise TypeError(
+            "AsyncGameModeWrapper flushes coalesced commands on the event loop"
+        )
+
+    def _send_pattern_body_now(self, body: bytes) -> None:  # type: ignore
+        raise TypeError("use 'await _send_pattern_body()' instead")
+
+    def _create_session(self) -> None:  # type: ignore[override]
+        """The aiohttp session needs a running event loop, so it is created
+            lazily by _get_session() instead."""
+        return None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it if needed.
+
+        Returns:
+            aiohttp.ClientSession: The session used for all requests
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                headers=self._headers
+            )
+        return self._session
+
+    async def close(self) -> None:  # type: ignore[override]
+        """Send any coalesced or background command still waiting, then
+            close the underlying aiohttp session."""
+        if self._pending_task is not None:
+            # the task only ever waits in asyncio.sleep, its commands are
+            # still pending and sent below
+            self._pending_task.cancel()
+            self._pending_task = None
+        for payload in self._pop_pending():
+            await self.send_command(payload)
+        await self._wait_background()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def send_command(  # type: ignore[override]
+        self,
+        command_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        wait: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Directly send a json command to the app and handle the response.
+
+        Args:
+            command_data (Dict[str, Any]): Json value to send to the app
+            timeout (Optional[float], optional): Overrides the session
+                timeout for this request. Defaults to None.
+            wait (bool, optional): Wait for the response. If False the command
+                is scheduled as a task and None is returned right away. It is
+                still sent before any command made after it. Defaults to True.
+
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        if not wait:
+            self._background_tail = asyncio.get_running_loop().create_task(
+                self._send_after(
+                    self._background_tail, command_data, timeout
+                )
+            )
+            self._background_tail.add_done_callback(_report_background_error)
+            return None
+
+        await self._wait_background()
+        return await self._send_command_now(command_data, timeout)
+
+    async def _wait_background(self) -> None:
+        """Wait for the commands sent with wait=False to go out."""
+        if self._background_tail is not None:
+            await asyncio.wait([self._background_tail])
+
+    async def _send_after(
+        self,
+        previous: Optional[asyncio.Task],
+        command_data: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """Send a background command once the one before it is done."""
+        if previous is not None:
+            await asyncio.wait([previous])
+        return await self._send_command_now(command_data, timeout)
+
+    async def _send_command_now(  # type: ignore[override]
+        self,
+        command_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Send a json command right away, see send_command().
+
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        body = self._prepare_command(command_data)
+        response_json = await self._send_body(
+            body, timeout, command_data.get("command")
+        )
+
+        # only remember commands the app actually answered
+        if response_json is not None:
+            self._remember_command(command_data, body)
+        return response_json
+
+    async def _send_body(  # type: ignore[override]
+        self,
+        body: bytes,
+        timeout: Optional[float] = None,
+        command: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Post an encoded json command to the app and handle the response.
+
+        Args:
+            body (bytes): The encoded json command
+            timeout (Optional[float], optional): Overrides the session
+                timeout for this request. Defaults to None.
+            command (Optional[str], optional): The name of the command, picks
+                the response parser. Defaults to None for the generic one.
+
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        # only override the session timeout when one is given
+        request_args: Dict[str, Any] = {}
+        if timeout is not None:
+            request_args["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        # make a request to the app.
+        try:
+            async with self._get_session().post(
+                self.api_endpoint,
+                data=body,
+                **request_args
+            ) as response:
+                status_code = response.status
+                content = await response.read()
+        except aiohttp.ClientConnectorError as e:
+            print("Error: Failed to establish a new connection")
+            self._log(e)
+            return None
+        except asyncio.TimeoutError as e:
+            print("Error: Request timed out")
+            self._log(e)
+            return None
+        except aiohttp.ClientError as e:
+            err_message = (
+                e if self.log
+                else f"{str(e)[:50]}... Enable logging for more info"
+            )
+            print(f'Error: An error occurred in the request: {err_message}')
+            return None
+
+        return self._handle_response(status_code, content, command)
+
+    async def _send_pattern_body(  # type: ignore[override]
+        self,
+        body: bytes
+    ) -> Optional[Dict[str, Any]]:
+        """Send an encoded pattern command, remembering it if answered.
+
+        Args:
+            body (bytes): The encoded json command
+
+        Returns:
+            Optional[Dict[str, Any]]: The json response code from the app
+        """
+        await self._wait_background()
+        response_json = await self._send_body(body, command="Pattern")
+        if response_json is not None:
+            self._remember_command(None, body)
+        return response_json
+
+    def function_request_coalesced(
+        self,
+        actions: Dict[str, float] | dict[Actions, float],
+        time: float = 0,
+        toy_id: Optional[str] = None,
+        linger_ms: float = 50
+    ) -> None:
+        """Queue a function request, merging it with any other requests made
+            within `linger_ms`. Same as the sync version, but the send is
+            scheduled on the running event loop, so this is not awaited.
+
+        Args:
+            actions (Dict[str, int]): A dictionary containing actions as keys
+                and their corresponding values. Use the `Actions` StrEnum.
+            time (float, optional): The time in seconds for the function
+                request. Defaults to 0 for indefinite time.
+            toy_id (Optional[str], optional): The ID of the toy. Defaults to
+                None for all devices.
+            linger_ms (float, optional): How long to wait for more requests
+                before sending, in milliseconds. Defaults to 50.
+        """
+        if self._merge_pending(actions, time, toy_id):
+            self._pending_task = asyncio.get_running_loop().create_task(
+                self._flush_pending_later(linger_ms)
+            )
+
+    async def _flush_pending_later(self, linger_ms: float) -> None:
+        """Wait out the linger window, then send the pending commands.
+
+        The commands are handed to the background sends, which close()
+        waits for, so cancelling this task never interrupts a request.
+        """
+        try:
+            await asyncio.sleep(linger_ms / 1000)
+            for payload in self._pop_pending():
+                await self.send_command(payload, wait=False)
+        finally:
+            if self._pending_task is asyncio.current_task():
+                self._pending_task = None
+
+    async def _cached_toys_request(  # type: ignore[override]
+        self,
+        command: str
+    ) -> Optional[Dict[str, Any]]:
+        """Send an informational toys command, reusing a recent response.
+
+        Args:
+            command (str): Either "GetToys" or "GetToyName"
+
+        Returns:
+            Optional[Dict[str, Any]]: The response from the app or the cache
+        """
+        cached = self._get_cached_toys(command)
+        if cached is not None:
+            return cached
+        return self._store_toys(command, await self.send_command({
+            "command": command
+        }))
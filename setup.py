@@ -25,6 +25,10 @@ setup(
     version=VERSION,
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={
+        'fast': ['orjson'],
+        'async': ['aiohttp'],
+    },
     author='Catboy',
     description='A python implementation of the Lovense API',
     long_description=long_description,
@@ -3,7 +3,16 @@ VERSION = "1.0.3"
 
 CHANGE_LOG = """
 Version 1.0.3
-
+- Use orjson for JSON parsing/logging when installed (pip install pylove[fast])
+- Added pylove/lan_async AsyncGameModeWrapper (pip install pylove[async])
+- Reuse one keep-alive requests.Session per GameModeWrapper, added close()
+- Added function_request_coalesced() to merge rapid function requests
+- Cache get_toys()/get_toys_name() responses for toys_ttl seconds
+- last_command is only updated when the app answered the command
+- stop() no longer blocks, send_command()/function_request() accept wait=False
+- GameModeWrapper uses __slots__, ad-hoc attributes can no longer be added
+- error_codes is now a shared read-only class attribute
+- requests is only imported once a GameModeWrapper is created
 
 Version 1.0.2
 - Uploaded to pypi and updated relevant details